@@ -0,0 +1,106 @@
+// Minimal bspc query driver: loops one command against the bspwm socket
+// and writes the raw int64 per-iteration timings (nanoseconds) to stdout.
+// Keeps the Python interpreter out of the measurement inner loop.
+//
+// Usage: bspc_probe <socket_path> <iterations> <arg> [<arg> ...]
+// Build: cc -O2 -o bspc_probe bspc_probe.c
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdint.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/socket.h>
+#include <sys/un.h>
+
+static uint64_t get_time_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC_RAW, &ts);
+    return ts.tv_sec * 1000000000ULL + ts.tv_nsec;
+}
+
+int main(int argc, char *argv[]) {
+    if (argc < 4) {
+        fprintf(stderr, "Usage: %s <socket_path> <iterations> <arg> [<arg> ...]\n", argv[0]);
+        return EXIT_FAILURE;
+    }
+
+    const char *socket_path = argv[1];
+    long iterations = strtol(argv[2], NULL, 10);
+    if (iterations <= 0) {
+        fprintf(stderr, "Bad iteration count: %s\n", argv[2]);
+        return EXIT_FAILURE;
+    }
+
+    // Build the null-delimited bspc wire message once
+    char msg[4096];
+    size_t msg_len = 0;
+    for (int i = 3; i < argc; i++) {
+        size_t arg_len = strlen(argv[i]) + 1;
+        if (msg_len + arg_len > sizeof(msg)) {
+            fprintf(stderr, "Message too large.\n");
+            return EXIT_FAILURE;
+        }
+        memcpy(msg + msg_len, argv[i], arg_len);
+        msg_len += arg_len;
+    }
+
+    struct sockaddr_un addr = {0};
+    addr.sun_family = AF_UNIX;
+    if (strlen(socket_path) >= sizeof(addr.sun_path)) {
+        fprintf(stderr, "Socket path too long.\n");
+        return EXIT_FAILURE;
+    }
+    strcpy(addr.sun_path, socket_path);
+
+    int64_t *times = malloc(iterations * sizeof(int64_t));
+    if (times == NULL) {
+        fprintf(stderr, "Failed to allocate timing buffer.\n");
+        return EXIT_FAILURE;
+    }
+
+    char rsp[BUFSIZ];
+
+    for (long i = 0; i < iterations; i++) {
+        // bspwm serves one message per connection, so reconnect per sample
+        int fd = socket(AF_UNIX, SOCK_STREAM, 0);
+        if (fd == -1) {
+            free(times);
+            fprintf(stderr, "Failed to create the socket.\n");
+            return EXIT_FAILURE;
+        }
+
+        uint64_t start = get_time_ns();
+
+        if (connect(fd, (struct sockaddr *) &addr, sizeof(addr)) == -1 ||
+            send(fd, msg, msg_len, MSG_NOSIGNAL) != (ssize_t) msg_len) {
+            close(fd);
+            free(times);
+            fprintf(stderr, "Failed to reach bspwm.\n");
+            return EXIT_FAILURE;
+        }
+
+        ssize_t n;
+        while ((n = recv(fd, rsp, sizeof(rsp), 0)) > 0)
+            ;
+
+        times[i] = (int64_t)(get_time_ns() - start);
+        close(fd);
+    }
+
+    // Raw little-endian int64 array on stdout; the harness frombuffers it
+    size_t total = iterations * sizeof(int64_t);
+    size_t written = 0;
+    while (written < total) {
+        ssize_t w = write(STDOUT_FILENO, (char *) times + written, total - written);
+        if (w <= 0) {
+            free(times);
+            return EXIT_FAILURE;
+        }
+        written += w;
+    }
+
+    free(times);
+    return EXIT_SUCCESS;
+}
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 
+import array
+import math
+import mmap
 import subprocess
 import time
 import statistics
+import selectors
+import socket
 import sys
 import os
 import json
@@ -10,28 +15,277 @@ import signal
 import tempfile
 import shutil
 from pathlib import Path
-from contextlib import contextmanager
+from contextlib import contextmanager, ExitStack
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # reductions fall back to the statistics module
+
+try:
+    # JIT the moment reduction for big sample arrays (throughput sweeps
+    # with 10^5+ iterations); percentiles stay on np.partition, where
+    # numba's support is uneven
+    import numba
+
+    @numba.njit(cache=True, fastmath=True)
+    def _reduce_moments(a):
+        return a.min(), a.max(), a.mean(), a.std()
+except ImportError:
+    numba = None
+    _reduce_moments = None
+
+try:
+    import orjson
+
+    def _dump_results(obj, filename):
+        # C-side serialization; the stdlib's indented encoder is the slow
+        # path once results carry many per-test float dicts
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    def _load_results(filename):
+        # Parse straight out of the page cache: the mapped file feeds
+        # orjson's C parser without an intermediate bytes copy
+        with open(filename, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ)
+            try:
+                return orjson.loads(mm)
+            finally:
+                mm.close()
+except ImportError:
+    orjson = None
+
+    def _dump_results(obj, filename):
+        with open(filename, 'w') as f:
+            json.dump(obj, f, indent=2)
+
+    def _load_results(filename):
+        with open(filename, 'r') as f:
+            return json.load(f)
+
+# Compiled timing driver shared with bspc_bench (cc -O2 -o bspc_probe
+# bspc_probe.c); when built, single-command tests run their whole inner
+# loop in C and Python only ingests the timing array
+_PROBE_BIN = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'bspc_probe')
+
+class _BspcSocket:
+    """Minimal bspc replacement speaking the wire protocol directly.
+
+    Forking bspc per call costs ~1-2ms of exec and linker work before a
+    single byte reaches bspwm; talking to the socket ourselves leaves only
+    the round-trip in the timed region. bspwm handles one message per
+    connection, so each request reconnects — that is a socket()+connect()
+    pair, still orders of magnitude below fork+exec.
+
+    This also covers the "one long-lived request/response worker" pattern:
+    a helper subprocess relaying stdin lines to the socket would add a
+    pipe round-trip on top of the same reconnect-per-message dance this
+    class already does in-process, so no such worker exists.
+    """
+
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+
+    @staticmethod
+    def encode(args):
+        return b'\x00'.join(a.encode() for a in args) + b'\x00'
+
+    def _connect(self, timeout=None, blocking=True):
+        """Open a connection with explicitly sized buffers.
+
+        64KB in both directions fits the largest query replies in a
+        single copy, so a send maps to one recv on the far side; sends
+        elsewhere use MSG_NOSIGNAL so a dying bspwm surfaces as an error
+        instead of SIGPIPE.
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+        if blocking:
+            sock.settimeout(timeout)
+        else:
+            sock.setblocking(False)
+        try:
+            sock.connect(self.socket_path)
+        except (BlockingIOError, InterruptedError):
+            pass  # non-blocking connect completes asynchronously
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def request(self, args, timeout=1.0):
+        """Send one command; return (reply_bytes, success)"""
+        sock = self._connect(timeout=timeout)
+        try:
+            sock.sendmsg([self.encode(args)], [], socket.MSG_NOSIGNAL)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        finally:
+            sock.close()
+        reply = b''.join(chunks)
+        return reply, not reply.startswith(b'\x07')
+
+    def pipeline(self, cmds, timeout=1.0):
+        """Send several different commands back-to-back, then drain.
+
+        One connection per command; every frame is in flight before the
+        first reply is read, so the three scheduler wakeups of serial
+        round-trips collapse into roughly one. Returns the reply list in
+        command order.
+        """
+        socks = []
+        try:
+            for args in cmds:
+                sock = self._connect(timeout=timeout)
+                socks.append(sock)
+                sock.sendmsg([self.encode(args)], [], socket.MSG_NOSIGNAL)
+            replies = []
+            for sock in socks:
+                chunks = []
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                replies.append(b''.join(chunks))
+            return replies
+        finally:
+            for sock in socks:
+                sock.close()
+
+    def batch(self, args, depth, timeout=2.0):
+        """Submit `depth` copies of one command as overlapped connections.
+
+        All frames are in flight before any reply is drained, so the
+        round-trips overlap in the kernel instead of completing serially —
+        a batched-submission throughput measurement rather than a latency
+        one. Returns (elapsed_ns, successes) for the window.
+        """
+        frame = self.encode(args)
+        sel = selectors.DefaultSelector()
+        replies = {}
+        completed = []
+        socks = []
+        pending = 0
+        start = time.perf_counter_ns()
+        try:
+            for _ in range(depth):
+                sock = self._connect(blocking=False)
+                socks.append(sock)
+                replies[sock] = b''
+                sel.register(sock, selectors.EVENT_WRITE)
+                pending += 1
+
+            deadline = time.monotonic() + timeout
+            while pending > 0 and time.monotonic() < deadline:
+                for key, events in sel.select(timeout=0.1):
+                    sock = key.fileobj
+                    if events & selectors.EVENT_WRITE:
+                        sock.sendmsg([frame], [], socket.MSG_NOSIGNAL)
+                        sel.modify(sock, selectors.EVENT_READ)
+                    elif events & selectors.EVENT_READ:
+                        chunk = sock.recv(65536)
+                        if chunk:
+                            replies[sock] += chunk
+                        else:
+                            sel.unregister(sock)
+                            completed.append(sock)
+                            pending -= 1
+            end = time.perf_counter_ns()
+        finally:
+            sel.close()
+            for sock in socks:
+                sock.close()
+
+        successes = sum(1 for sock in completed
+                        if not replies[sock].startswith(b'\x07'))
+        return end - start, successes
+
+def _terminate(proc):
+    """Tear down one child's process group: TERM, brief grace, then KILL"""
+    try:
+        pgid = os.getpgid(proc.pid)
+    except ProcessLookupError:
+        return
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    try:
+        proc.wait(timeout=0.5)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+def _pin(pid, cpu, fifo=False):
+    """Best-effort: pin `pid` to one CPU, optionally with SCHED_FIFO.
+
+    Everything degrades silently — without CAP_SYS_NICE (run under sudo
+    to get it) the affinity usually still applies and only the priority
+    boost is lost.
+    """
+    try:
+        os.sched_setaffinity(pid, {cpu})
+    except OSError:
+        return
+    if fifo:
+        try:
+            os.sched_setscheduler(pid, os.SCHED_FIFO, os.sched_param(50))
+        except (AttributeError, PermissionError, OSError):
+            pass
+
+def _spawn_bspc(bspc_binary, args, env):
+    """Run one bspc command via posix_spawn, output discarded.
+
+    Popen forks first, which duplicates the parent's page tables before
+    execve; posix_spawn takes the vfork-style path, so fallback calls
+    that only need the exit status skip that cost. Returns True when the
+    command exited 0.
+    """
+    try:
+        pid = os.posix_spawn(
+            bspc_binary, [bspc_binary] + args, env,
+            file_actions=[
+                (os.POSIX_SPAWN_OPEN, 1, '/dev/null', os.O_WRONLY, 0),
+                (os.POSIX_SPAWN_OPEN, 2, '/dev/null', os.O_WRONLY, 0),
+            ])
+        _, status = os.waitpid(pid, 0)
+    except OSError:
+        return False
+    return os.waitstatus_to_exitcode(status) == 0
 
 class IsolatedBspwmBenchmark:
     def __init__(self):
         self.iterations = 50  # Reduced for isolation overhead
         self.warmup_iterations = 5
         self.results = {}
-        self.cleanup_pids = []
+        self._pgids = []
+        self.sock = None  # set while inside isolated_bspwm
 
     def __del__(self):
         self.cleanup_all()
 
     def cleanup_all(self):
-        """Clean up any remaining processes"""
-        for pid in self.cleanup_pids:
+        """Clean up any remaining process groups, one syscall each.
+
+        Xvfb and bspwm run in their own sessions, so killpg reaps each
+        subtree at once — no per-pid SIGTERM/sleep/SIGKILL ladder.
+        """
+        for pgid in self._pgids:
             try:
-                os.kill(pid, signal.SIGTERM)
-                time.sleep(0.1)
-                os.kill(pid, signal.SIGKILL)
+                os.killpg(pgid, signal.SIGKILL)
             except (ProcessLookupError, PermissionError):
                 pass
-        self.cleanup_pids.clear()
+        self._pgids.clear()
 
     @contextmanager
     def isolated_bspwm(self, bspwm_binary, bspc_binary, display_num):
@@ -40,6 +294,12 @@ class IsolatedBspwmBenchmark:
         xvfb_proc = None
         bspwm_proc = None
         temp_socket = None
+        saved_env = None
+        local_pgids = []
+        # Teardown callbacks are pushed as children are created, so the
+        # stack unwinds them LIFO (bspwm before its X server) and covers
+        # partial startup failures for free
+        stack = ExitStack()
 
         try:
             # Start Xvfb
@@ -48,35 +308,84 @@ class IsolatedBspwmBenchmark:
                 'Xvfb', display,
                 '-screen', '0', '1920x1080x24',
                 '-ac', '+extension', 'GLX'
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            self.cleanup_pids.append(xvfb_proc.pid)
-            time.sleep(1)  # Let Xvfb start
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+               start_new_session=True)
+            local_pgids.append(os.getpgid(xvfb_proc.pid))
+            self._pgids.append(local_pgids[-1])
+            stack.callback(_terminate, xvfb_proc)
+
+            # Proceed as soon as the display socket exists instead of
+            # sleeping out a fixed second; Xvfb is typically up in tens
+            # of milliseconds
+            x11_socket = f"/tmp/.X11-unix/X{display_num}"
+            for _ in range(200):
+                if os.path.exists(x11_socket):
+                    break
+                time.sleep(0.005)
+            else:
+                raise RuntimeError(f"Xvfb did not come up on {display}")
 
             # Create temp socket path
             temp_socket = f"/tmp/bspwm-bench-{display_num}-{os.getpid()}"
 
-            # Set environment for this bspwm instance
-            env = os.environ.copy()
-            env['DISPLAY'] = display
-            env['BSPWM_SOCKET'] = temp_socket
+            # DISPLAY and BSPWM_SOCKET are the only variables the children
+            # care about and they never change inside this context, so set
+            # them on the harness's own environment (restored in finally).
+            # Children and fallback subprocess calls then inherit them via
+            # env=None, which skips Popen's per-call re-encoding of the
+            # whole environment into a char** for execve.
+            saved_env = {k: os.environ.get(k)
+                         for k in ('DISPLAY', 'BSPWM_SOCKET')}
+            os.environ['DISPLAY'] = display
+            os.environ['BSPWM_SOCKET'] = temp_socket
+            env = os.environ
 
             # Start bspwm
             print(f"  Starting bspwm ({os.path.basename(bspwm_binary)}) on {display}...")
             bspwm_proc = subprocess.Popen([bspwm_binary],
-                                        env=env,
                                         stdout=subprocess.DEVNULL,
-                                        stderr=subprocess.DEVNULL)
-            self.cleanup_pids.append(bspwm_proc.pid)
-            time.sleep(1)  # Let bspwm initialize
-
-            # Verify bspwm is responding
-            test_proc = subprocess.run([bspc_binary, 'query', '-D'],
-                                     env=env, capture_output=True, timeout=5)
-            if test_proc.returncode != 0:
+                                        stderr=subprocess.DEVNULL,
+                                        start_new_session=True)
+            local_pgids.append(os.getpgid(bspwm_proc.pid))
+            self._pgids.append(local_pgids[-1])
+            stack.callback(_terminate, bspwm_proc)
+
+            # Readiness doubles as verification: retry a query -D round
+            # trip against the socket until it answers, replacing the old
+            # fixed sleep plus separate test call
+            probe = _BspcSocket(temp_socket)
+            for _ in range(200):
+                try:
+                    _, ok = probe.request(['query', '-D'], timeout=0.2)
+                    if ok:
+                        break
+                except OSError:
+                    pass
+                time.sleep(0.005)
+            else:
                 raise RuntimeError(f"bspwm not responding on {display}")
 
             print(f"  ✓ bspwm ready on {display}")
 
+            # Give Xvfb, bspwm and the harness each their own CPU out of
+            # whatever set this process may use (the parallel all mode
+            # hands every worker a disjoint pair), so the three stop
+            # preempting each other mid-sample; bspwm additionally gets a
+            # FIFO priority boost when permissions allow
+            avail = sorted(os.sched_getaffinity(0))
+            cpus = (avail * 3)[:3]
+            _pin(xvfb_proc.pid, cpus[0])
+            _pin(bspwm_proc.pid, cpus[1], fifo=True)
+            _pin(0, cpus[2])
+            try:
+                os.nice(-10)
+            except OSError:
+                pass
+
+            # Direct socket client for the test hot paths; the bspc binary
+            # stays around for setup/validation calls
+            self.sock = _BspcSocket(temp_socket)
+
             # Yield the environment for testing
             yield env, bspc_binary
 
@@ -84,30 +393,20 @@ class IsolatedBspwmBenchmark:
             print(f"  ✗ Failed to setup isolated bspwm: {e}")
             raise
         finally:
-            # Cleanup
-            if bspwm_proc:
-                try:
-                    bspwm_proc.terminate()
-                    bspwm_proc.wait(timeout=2)
-                except (subprocess.TimeoutExpired, ProcessLookupError):
-                    try:
-                        bspwm_proc.kill()
-                    except ProcessLookupError:
-                        pass
-                if bspwm_proc.pid in self.cleanup_pids:
-                    self.cleanup_pids.remove(bspwm_proc.pid)
-
-            if xvfb_proc:
-                try:
-                    xvfb_proc.terminate()
-                    xvfb_proc.wait(timeout=2)
-                except (subprocess.TimeoutExpired, ProcessLookupError):
-                    try:
-                        xvfb_proc.kill()
-                    except ProcessLookupError:
-                        pass
-                if xvfb_proc.pid in self.cleanup_pids:
-                    self.cleanup_pids.remove(xvfb_proc.pid)
+            # Cleanup: unwind the stack (LIFO _terminate per child)
+            self.sock = None
+
+            if saved_env is not None:
+                for key, value in saved_env.items():
+                    if value is None:
+                        os.environ.pop(key, None)
+                    else:
+                        os.environ[key] = value
+
+            stack.close()
+            for pgid in local_pgids:
+                if pgid in self._pgids:
+                    self._pgids.remove(pgid)
 
             # Clean up socket
             if temp_socket and os.path.exists(temp_socket):
@@ -117,143 +416,316 @@ class IsolatedBspwmBenchmark:
                     pass
 
     def setup_test_scenario(self, env, bspc_binary, scenario="default"):
-        """Setup a specific window layout scenario"""
-        try:
-            if scenario == "default":
-                # Create a basic desktop layout
-                subprocess.run([bspc_binary, 'monitor', '-d', 'I', 'II', 'III'],
-                             env=env, check=True, timeout=2)
-
-            elif scenario == "complex":
-                # Create complex layout with nested splits
-                subprocess.run([bspc_binary, 'monitor', '-d', 'test'],
-                             env=env, check=True, timeout=2)
-
-                # Simulate windows by creating nodes (without actual X windows)
-                for i in range(10):
-                    # We can't easily create fake windows, but we can test the commands
-                    pass
+        """Setup a specific window layout scenario.
+
+        Setup commands go over the socket as one pipelined burst when the
+        client is available, so parametric scenarios scale to hundreds of
+        commands without paying a fork+exec each; the bspc binary remains
+        the fallback.
+        """
+        if scenario == "complex":
+            # A wider desktop set plus per-desktop layout tweaks —
+            # deliberately more than one message so setup exercises the
+            # batched path
+            desktops = [f"d{i}" for i in range(10)]
+            cmds = [['monitor', '-d'] + desktops]
+            cmds += [['desktop', name, '-l', 'tiled'] for name in desktops]
+        else:
+            # Create a basic desktop layout
+            cmds = [['monitor', '-d', 'I', 'II', 'III']]
 
-        except subprocess.CalledProcessError as e:
-            print(f"  Warning: Failed to setup scenario '{scenario}': {e}")
+        if self.sock is not None:
+            try:
+                replies = self.sock.pipeline(cmds, timeout=2.0)
+            except OSError as e:
+                print(f"  Warning: Failed to setup scenario '{scenario}': {e}")
+                return
+            failed = sum(1 for r in replies if r.startswith(b'\x07'))
+            if failed:
+                print(f"  Warning: {failed}/{len(cmds)} setup commands "
+                      f"failed for scenario '{scenario}'")
+            return
+
+        for cmd in cmds:
+            if not _spawn_bspc(bspc_binary, cmd, dict(os.environ)):
+                print(f"  Warning: Failed to setup scenario '{scenario}': "
+                      f"{' '.join(cmd)}")
+
+    def _probe_times(self, args):
+        """Run one command's timing loop inside the compiled probe.
+
+        perf_counter_ns bracketing in Python costs about as much as a
+        socket round-trip, so the interpreter's overhead sits on top of
+        every sample; the C driver's loop floor is ~50ns. Returns the raw
+        nanosecond array, or None when the probe is unbuilt or fails.
+        """
+        if self.sock is None or not os.path.exists(_PROBE_BIN):
+            return None
+        try:
+            raw = subprocess.check_output(
+                [_PROBE_BIN, self.sock.socket_path,
+                 str(self.iterations)] + list(args),
+                timeout=10 + self.iterations * 0.01)
+        except (subprocess.SubprocessError, OSError):
+            return None
+        if len(raw) != 8 * self.iterations:
+            return None
+        if np is not None:
+            return np.frombuffer(raw, dtype=np.int64)
+        return array.array('q', raw)
 
-    def run_with_stats(self, name, test_func, env, bspc_binary):
+    def run_with_stats(self, version_name, name, test_func, env, bspc_binary,
+                       probe_cmd=None):
         """Run benchmark with proper statistical analysis"""
         print(f"    Benchmarking {name}...")
 
-        # Warmup
-        for _ in range(self.warmup_iterations):
-            try:
-                test_func(env, bspc_binary)
-            except:
-                pass  # Ignore warmup failures
-
-        # Actual measurements
-        times = []
+        times = None
         successful_runs = 0
 
-        for i in range(self.iterations):
-            try:
+        # Single-command tests go through the C driver when it is built,
+        # keeping the interpreter out of the measured loop entirely
+        if probe_cmd is not None:
+            times = self._probe_times(probe_cmd)
+            if times is not None:
+                successful_runs = len(times)
+
+        if times is None:
+            # Warmup with an online (Welford) variance monitor: stop as
+            # soon as the coefficient of variation of the warmup timings
+            # drops under 5%, so already-warm paths exit after three
+            # iterations and only genuinely cold ones use the full budget
+            w_n = 0
+            w_mean = 0.0
+            w_m2 = 0.0
+            while w_n < self.warmup_iterations:
                 start = time.perf_counter_ns()
-                result = test_func(env, bspc_binary)
-                end = time.perf_counter_ns()
+                try:
+                    test_func(env, bspc_binary)
+                except:
+                    pass  # Ignore warmup failures
+                sample = time.perf_counter_ns() - start
+                w_n += 1
+                delta = sample - w_mean
+                w_mean += delta / w_n
+                w_m2 += delta * (sample - w_mean)
+                if w_n >= 3 and w_mean > 0 and \
+                        math.sqrt(w_m2 / (w_n - 1)) / w_mean < 0.05:
+                    break
+            print(f"    warmup converged in {w_n} iters")
+
+            # Actual measurements into a preallocated int64 slab: indexed
+            # stores keep list growth and PyLong boxing out of the loop
+            # whose overhead already rivals the event being measured
+            times = array.array('q', bytes(8 * self.iterations))
+
+            for i in range(self.iterations):
+                try:
+                    start = time.perf_counter_ns()
+                    result = test_func(env, bspc_binary)
+                    end = time.perf_counter_ns()
 
-                if result is not False:  # Allow None, but not False (explicit failure)
-                    times.append(end - start)
-                    successful_runs += 1
+                    if result is not False:  # Allow None, but not False (explicit failure)
+                        times[successful_runs] = end - start
+                        successful_runs += 1
 
-            except Exception as e:
-                # Skip failed iterations but track them
-                pass
+                except Exception as e:
+                    # Skip failed iterations but track them
+                    pass
+
+            times = times[:successful_runs]
 
-        if not times:
+        if len(times) == 0:
             print(f"    ✗ All benchmark iterations failed for {name}")
             return None
 
         if successful_runs < self.iterations * 0.8:  # Less than 80% success rate
             print(f"    ⚠ Low success rate for {name}: {successful_runs}/{self.iterations}")
 
-        # Convert to microseconds
-        times_us = [t / 1000 for t in times]
+        # Convert to microseconds and reduce
+        if np is not None:
+            # O(N) selection via np.partition instead of one full sort per
+            # percentile, and vectorized moments
+            # array.array shares its buffer with numpy here — no copy
+            if isinstance(times, array.array):
+                a = np.frombuffer(times, dtype=np.int64) / 1000.0
+            else:
+                a = np.asarray(times, dtype=np.int64) / 1000.0
+            n = len(a)
+            k95 = int(0.95 * n)
+            k99 = int(0.99 * n)
+            if _reduce_moments is not None and n > 1024:
+                mn, mx, mean, pstd = (float(v) for v in _reduce_moments(a))
+                stdev = pstd * math.sqrt(n / (n - 1)) if n > 1 else 0
+            else:
+                mn, mx, mean = float(a.min()), float(a.max()), float(a.mean())
+                stdev = float(a.std(ddof=1)) if n > 1 else 0
+            stats = {
+                'min': mn,
+                'max': mx,
+                'mean': mean,
+                'median': float(np.median(a)),
+                'stdev': stdev,
+                'p95': float(np.partition(a, k95)[k95]),
+                'p99': float(np.partition(a, k99)[k99]),
+                'samples': n,
+                'success_rate': successful_runs / self.iterations
+            }
+        else:
+            srt = sorted(t / 1000 for t in times)
+            n = len(srt)
+            stats = {
+                'min': srt[0],
+                'max': srt[-1],
+                'mean': statistics.mean(srt),
+                'median': srt[n // 2] if n % 2 else
+                          (srt[n // 2 - 1] + srt[n // 2]) / 2,
+                'stdev': statistics.stdev(srt) if n > 1 else 0,
+                'p95': srt[int(0.95 * n)],
+                'p99': srt[int(0.99 * n)],
+                'samples': n,
+                'success_rate': successful_runs / self.iterations
+            }
+
+        self.results.setdefault(version_name, {})[name] = stats
 
+        print(f"    Mean: {stats['mean']:.2f}μs ± {stats['stdev']:.2f}μs "
+              f"(success: {stats['success_rate']:.1%})")
+
+        return stats
+
+    def run_throughput(self, version_name, name, args, depth=32):
+        """Stress bspwm's message loop with windows of overlapped requests.
+
+        Complements run_with_stats: that one measures isolated round-trip
+        latency, this one measures how the event loop behaves when `depth`
+        requests are outstanding at once. Per-op stats come from the
+        window mean; ops_per_sec is reported alongside.
+        """
+        if self.sock is None:
+            return None
+
+        print(f"    Benchmarking {name} (depth={depth})...")
+
+        per_op_us = []
+        successful = 0
+        total_ns = 0
+        for _ in range(self.iterations):
+            try:
+                elapsed_ns, ok = self.sock.batch(args, depth)
+            except OSError:
+                continue
+            per_op_us.append(elapsed_ns / depth / 1000)
+            successful += ok
+            total_ns += elapsed_ns
+
+        if not per_op_us:
+            print(f"    ✗ All throughput windows failed for {name}")
+            return None
+
+        total_ops = self.iterations * depth
         stats = {
-            'min': min(times_us),
-            'max': max(times_us),
-            'mean': statistics.mean(times_us),
-            'median': statistics.median(times_us),
-            'stdev': statistics.stdev(times_us) if len(times_us) > 1 else 0,
-            'p95': sorted(times_us)[int(0.95 * len(times_us))] if times_us else 0,
-            'p99': sorted(times_us)[int(0.99 * len(times_us))] if times_us else 0,
-            'samples': len(times_us),
-            'success_rate': successful_runs / self.iterations
+            'min': min(per_op_us),
+            'max': max(per_op_us),
+            'mean': statistics.mean(per_op_us),
+            'median': statistics.median(per_op_us),
+            'stdev': statistics.stdev(per_op_us) if len(per_op_us) > 1 else 0,
+            'p95': sorted(per_op_us)[int(0.95 * len(per_op_us))],
+            'p99': sorted(per_op_us)[int(0.99 * len(per_op_us))],
+            'samples': len(per_op_us),
+            'success_rate': successful / total_ops,
+            'ops_per_sec': total_ops / (total_ns / 1e9) if total_ns else 0
         }
 
-        self.results[name] = stats
+        self.results.setdefault(version_name, {})[name] = stats
 
-        print(f"    Mean: {stats['mean']:.2f}μs ± {stats['stdev']:.2f}μs "
+        print(f"    Mean: {stats['mean']:.2f}μs/op, "
+              f"{stats['ops_per_sec']:.0f} ops/s "
               f"(success: {stats['success_rate']:.1%})")
 
         return stats
 
-    # Test functions that work with bspc
+    # Test functions; each goes over the socket when available and falls
+    # back to the bspc binary otherwise
+    def _query_len(self, env, bspc_binary, args):
+        """Issue one command, return reply length or False on failure"""
+        if self.sock is not None:
+            reply, ok = self.sock.request(args)
+            return len(reply) if ok else False
+        # env inherited from the harness; isolated_bspwm exports DISPLAY
+        # and BSPWM_SOCKET for the context's lifetime
+        result = subprocess.run([bspc_binary] + args,
+                              capture_output=True, timeout=1)
+        return len(result.stdout) if result.returncode == 0 else False
+
+    def _command_pair(self, env, bspc_binary, first, second):
+        """Issue two commands back-to-back, return True if both succeed"""
+        if self.sock is not None:
+            _, ok1 = self.sock.request(first)
+            _, ok2 = self.sock.request(second)
+            return ok1 and ok2
+        return _spawn_bspc(bspc_binary, first, env) and \
+            _spawn_bspc(bspc_binary, second, env)
+
     def test_query_desktops(self, env, bspc_binary):
         """Test desktop query performance"""
-        result = subprocess.run([bspc_binary, 'query', '-D'],
-                              env=env, capture_output=True, timeout=1)
-        return len(result.stdout) if result.returncode == 0 else False
+        return self._query_len(env, bspc_binary, ['query', '-D'])
 
     def test_query_monitors(self, env, bspc_binary):
         """Test monitor query performance"""
-        result = subprocess.run([bspc_binary, 'query', '-M'],
-                              env=env, capture_output=True, timeout=1)
-        return len(result.stdout) if result.returncode == 0 else False
+        return self._query_len(env, bspc_binary, ['query', '-M'])
 
     def test_query_nodes(self, env, bspc_binary):
         """Test node query performance"""
-        result = subprocess.run([bspc_binary, 'query', '-N'],
-                              env=env, capture_output=True, timeout=1)
-        return len(result.stdout) if result.returncode == 0 else False
+        return self._query_len(env, bspc_binary, ['query', '-N'])
 
     def test_desktop_operations(self, env, bspc_binary):
         """Test desktop switching operations"""
-        try:
-            # Switch to desktop II
-            subprocess.run([bspc_binary, 'desktop', '-f', 'II'],
-                          env=env, check=True, timeout=1)
-            # Switch back to I
-            subprocess.run([bspc_binary, 'desktop', '-f', 'I'],
-                          env=env, check=True, timeout=1)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return self._command_pair(env, bspc_binary,
+                                  ['desktop', '-f', 'II'],
+                                  ['desktop', '-f', 'I'])
 
     def test_layout_operations(self, env, bspc_binary):
         """Test layout switching"""
-        try:
-            subprocess.run([bspc_binary, 'desktop', '-l', 'monocle'],
-                          env=env, check=True, timeout=1)
-            subprocess.run([bspc_binary, 'desktop', '-l', 'tiled'],
-                          env=env, check=True, timeout=1)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return self._command_pair(env, bspc_binary,
+                                  ['desktop', '-l', 'monocle'],
+                                  ['desktop', '-l', 'tiled'])
 
     def test_config_operations(self, env, bspc_binary):
         """Test configuration queries"""
-        result = subprocess.run([bspc_binary, 'config', 'border_width'],
-                              env=env, capture_output=True, timeout=1)
-        return len(result.stdout) if result.returncode == 0 else False
+        return self._query_len(env, bspc_binary, ['config', 'border_width'])
+
+    def test_query_pipeline(self, env, bspc_binary):
+        """Test the three queries issued as one pipelined burst.
+
+        Characterizes the message loop under back-pressure, next to the
+        per-query tests' isolated latency. Socket-only: there is no
+        meaningful subprocess equivalent.
+        """
+        if self.sock is None:
+            return False
+        try:
+            replies = self.sock.pipeline([['query', '-D'],
+                                          ['query', '-M'],
+                                          ['query', '-N']])
+        except OSError:
+            return False
+        return all(not r.startswith(b'\x07') for r in replies)
+
+    # RSS pages to KB; sysconf never changes, so resolve it once
+    PAGE_KB = os.sysconf('SC_PAGESIZE') // 1024
 
     def get_memory_usage(self, bspwm_proc):
-        """Get memory usage of bspwm process"""
+        """Get memory usage of bspwm process in KB.
+
+        Reads field 2 of /proc/<pid>/statm directly — forking ps to
+        fetch one integer costs ~5ms and races PID reuse.
+        """
         try:
-            result = subprocess.run(['ps', '-p', str(bspwm_proc.pid), '-o', 'rss='],
-                                  capture_output=True, text=True, timeout=1)
-            if result.returncode == 0:
-                return int(result.stdout.strip())  # RSS in KB
-        except:
-            pass
-        return 0
+            with open(f'/proc/{bspwm_proc.pid}/statm', 'rb') as f:
+                rss_pages = int(f.read().split()[1])
+            return rss_pages * self.PAGE_KB
+        except (OSError, ValueError, IndexError):
+            return 0
 
     def run_benchmarks(self, version_name, bspwm_binary, bspc_binary, display_num):
         """Run full benchmark suite for a version"""
@@ -282,18 +754,27 @@ class IsolatedBspwmBenchmark:
             # Setup test scenario
             self.setup_test_scenario(env, bspc, "default")
 
-            # Run benchmarks
+            # Run benchmarks; single-command tests carry the argv the C
+            # probe can replay, multi-command ones stay in Python. Test
+            # names are bare — the version is the outer results key.
             tests = [
-                (f"{version_name}_query_desktops", self.test_query_desktops),
-                (f"{version_name}_query_monitors", self.test_query_monitors),
-                (f"{version_name}_query_nodes", self.test_query_nodes),
-                (f"{version_name}_desktop_ops", self.test_desktop_operations),
-                (f"{version_name}_layout_ops", self.test_layout_operations),
-                (f"{version_name}_config_ops", self.test_config_operations),
+                ("query_desktops", self.test_query_desktops, ['query', '-D']),
+                ("query_monitors", self.test_query_monitors, ['query', '-M']),
+                ("query_nodes", self.test_query_nodes, ['query', '-N']),
+                ("desktop_ops", self.test_desktop_operations, None),
+                ("layout_ops", self.test_layout_operations, None),
+                ("config_ops", self.test_config_operations,
+                 ['config', 'border_width']),
+                ("query_pipeline", self.test_query_pipeline, None),
             ]
 
-            for test_name, test_func in tests:
-                self.run_with_stats(test_name, test_func, env, bspc)
+            for test_name, test_func, probe_cmd in tests:
+                self.run_with_stats(version_name, test_name, test_func,
+                                    env, bspc, probe_cmd=probe_cmd)
+
+            # Batched-submission stress of the message loop
+            self.run_throughput(version_name, "query_throughput",
+                                ['query', '-D'])
 
         return version_results
 
@@ -301,40 +782,42 @@ class IsolatedBspwmBenchmark:
         """Compare benchmark results between versions"""
         print(f"\n=== Performance Comparison: {baseline_name} vs {optimized_name} ===\n")
 
+        # Two-level layout: results[version][test]. Comparison is a plain
+        # dict lookup per test — no substring matching on composed keys,
+        # which also stops versions with a shared prefix from colliding.
+        baseline_tests = self.results.get(baseline_name, {})
+        optimized_tests = self.results.get(optimized_name, {})
+
         comparisons = []
-        for test_name in self.results:
-            if baseline_name in test_name:
-                opt_name = test_name.replace(baseline_name, optimized_name)
-                if opt_name in self.results:
-                    baseline = self.results[test_name]
-                    optimized = self.results[opt_name]
-
-                    if 'mean' in baseline and 'mean' in optimized and baseline['mean'] > 0:
-                        speedup = baseline['mean'] / optimized['mean']
-                        reduction = (1 - optimized['mean'] / baseline['mean']) * 100
-
-                        test_display = test_name.replace(f"{baseline_name}_", "")
-
-                        print(f"{test_display}:")
-                        print(f"  {baseline_name}: {baseline['mean']:.2f}μs ± {baseline['stdev']:.2f}μs")
-                        print(f"  {optimized_name}: {optimized['mean']:.2f}μs ± {optimized['stdev']:.2f}μs")
-                        print(f"  Speedup: {speedup:.2f}x ({reduction:+.1f}%)")
-
-                        # Simple significance test
-                        if baseline['stdev'] > 0 and optimized['stdev'] > 0:
-                            diff = abs(baseline['mean'] - optimized['mean'])
-                            combined_std = (baseline['stdev'] + optimized['stdev']) / 2
-                            if diff > 2 * combined_std:
-                                print(f"  Significance: LIKELY SIGNIFICANT")
-                            else:
-                                print(f"  Significance: inconclusive")
-                        print()
-
-                        comparisons.append({
-                            'test': test_display,
-                            'speedup': speedup,
-                            'reduction': reduction
-                        })
+        for test_name, baseline in baseline_tests.items():
+            optimized = optimized_tests.get(test_name)
+            if not optimized:
+                continue
+
+            if 'mean' in baseline and 'mean' in optimized and baseline['mean'] > 0:
+                speedup = baseline['mean'] / optimized['mean']
+                reduction = (1 - optimized['mean'] / baseline['mean']) * 100
+
+                print(f"{test_name}:")
+                print(f"  {baseline_name}: {baseline['mean']:.2f}μs ± {baseline['stdev']:.2f}μs")
+                print(f"  {optimized_name}: {optimized['mean']:.2f}μs ± {optimized['stdev']:.2f}μs")
+                print(f"  Speedup: {speedup:.2f}x ({reduction:+.1f}%)")
+
+                # Simple significance test
+                if baseline['stdev'] > 0 and optimized['stdev'] > 0:
+                    diff = abs(baseline['mean'] - optimized['mean'])
+                    combined_std = (baseline['stdev'] + optimized['stdev']) / 2
+                    if diff > 2 * combined_std:
+                        print(f"  Significance: LIKELY SIGNIFICANT")
+                    else:
+                        print(f"  Significance: inconclusive")
+                print()
+
+                comparisons.append({
+                    'test': test_name,
+                    'speedup': speedup,
+                    'reduction': reduction
+                })
 
         # Summary
         if comparisons:
@@ -349,12 +832,28 @@ class IsolatedBspwmBenchmark:
 
     def save_results(self, filename):
         """Save results to JSON"""
-        with open(filename, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        _dump_results(self.results, filename)
+
+def _run_one(version_name, bspwm_binary, bspc_binary, display_num, cpus=None):
+    """Benchmark one version in its own process; returns the results dict.
+
+    Module-level so it pickles into a ProcessPoolExecutor worker. Each
+    version already lives in its own Xvfb display and socket, so two
+    workers can run side by side; `cpus` optionally pins the worker to a
+    disjoint CPU set to keep the runs from perturbing each other.
+    """
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError:
+            pass
+    bench = IsolatedBspwmBenchmark()
+    bench.run_benchmarks(version_name, bspwm_binary, bspc_binary, display_num)
+    return bench.results
 
 def check_dependencies():
     """Check if required tools are available"""
-    required = ['Xvfb', 'ps']
+    required = ['Xvfb']  # memory sampling reads /proc directly, no ps
     missing = []
 
     for tool in required:
@@ -392,10 +891,8 @@ if __name__ == "__main__":
 
         elif sys.argv[1] == "compare":
             try:
-                with open("isolated_bench_current.json", 'r') as f:
-                    current_results = json.load(f)
-                with open("isolated_bench_upstream.json", 'r') as f:
-                    upstream_results = json.load(f)
+                current_results = _load_results("isolated_bench_current.json")
+                upstream_results = _load_results("isolated_bench_upstream.json")
 
                 bench.results.update(current_results)
                 bench.results.update(upstream_results)
@@ -408,32 +905,39 @@ if __name__ == "__main__":
         elif sys.argv[1] == "all":
             print("=== Running Complete Isolated Benchmark Suite ===")
 
-            current_results = {}
-            upstream_results = {}
-
-            # Current version
+            # Each version gets its own display, socket and CPU pair, so
+            # the two runs are independent and can proceed concurrently
+            jobs = []
             if os.path.exists(current_binary) and os.path.exists(current_bspc):
-                bench.results.clear()  # Clear before running
-                bench.run_benchmarks("current", current_binary, current_bspc, 99)
-                current_results = bench.results.copy()
-                bench.save_results("isolated_bench_current.json")
+                jobs.append(("current", current_binary, current_bspc, 99,
+                             {0, 1}, "isolated_bench_current.json"))
             else:
                 print(f"Warning: Current binaries not found, skipping")
-
-            # Upstream version
             if os.path.exists(upstream_binary) and os.path.exists(upstream_bspc):
-                bench.results.clear()  # Clear before running
-                bench.run_benchmarks("upstream", upstream_binary, upstream_bspc, 100)
-                upstream_results = bench.results.copy()
-                bench.save_results("isolated_bench_upstream.json")
+                jobs.append(("upstream", upstream_binary, upstream_bspc, 100,
+                             {2, 3}, "isolated_bench_upstream.json"))
             else:
                 print(f"Warning: Upstream binaries not found, skipping")
 
+            per_version = {}
+            if jobs:
+                with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+                    futures = [
+                        (name, outfile,
+                         pool.submit(_run_one, name, binary, bspc, display,
+                                     cpus))
+                        for name, binary, bspc, display, cpus, outfile in jobs
+                    ]
+                    for name, outfile, future in futures:
+                        per_version[name] = future.result()
+                        bench.results = per_version[name]
+                        bench.save_results(outfile)
+
             # Compare
-            if current_results and upstream_results:
-                bench.results.clear()
-                bench.results.update(current_results)
-                bench.results.update(upstream_results)
+            if len(per_version) == 2:
+                bench.results = {}
+                for version_results in per_version.values():
+                    bench.results.update(version_results)
                 bench.compare_results("upstream", "current")
         else:
             print(f"Unknown command: {sys.argv[1]}")
@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 
+import functools
 import subprocess
 import os
 import time
 import shutil
 
+# One PATH walk per tool for the whole run
+_which = functools.cache(shutil.which)
+
 def test_display_isolation():
     """Test if we can run bspwm on different displays simultaneously"""
     print("Testing display isolation...")
 
-    if not shutil.which('Xvfb'):
+    if not _which('Xvfb'):
         print("❌ Xvfb not found. Install with: sudo pacman -S xorg-server-xvfb")
         return False
 
@@ -103,7 +107,7 @@ def main():
         print("The tests will use separate virtual displays (:99, :100)")
         print("while your desktop stays on the current display.")
 
-        if not shutil.which('Xvfb'):
+        if not _which('Xvfb'):
             print("\n📦 Next step: sudo pacman -S xorg-server-xvfb")
         else:
             print("\n🚀 Ready to run: python3 isolated_bench.py all")